@@ -4,17 +4,43 @@ AI agent for generating contextual directory names based on file analysis.
 """
 
 import anthropic
+import asyncio
+import functools
+import hashlib
 import json
 import os
-from typing import Dict, Optional
+import shelve
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
 import re
 
+# Precompiled patterns used on every generated name
+_CONTENT_TYPE_RE = re.compile(r'^([a-z]+)')
+_VALID_NAME_RE = re.compile(r'^[a-z][a-zA-Z0-9]*\Z')
+
+@functools.lru_cache(maxsize=None)
+def _resolve_data_home_path(data_home_root: str, relative_path: str) -> str:
+    """Join a DATA-HOME relative path onto filetree/roots, once per distinct pair."""
+    return os.path.join(data_home_root, "filetree/roots", relative_path)
+
+# Extensions that identify a directory of plain recordings when they are the only file type
+_RECORDING_EXTENSIONS = frozenset({'.mp3', '.wav', '.m4a', '.flac', '.aac', '.ogg', '.wma'})
+
 class DirectoryNamingAgent:
-    def __init__(self, api_key: Optional[str] = None):
-        """Initialize the AI naming agent."""
+    def __init__(self, api_key: Optional[str] = None, cache_dir: Optional[str] = None):
+        """Initialize the AI naming agent.
+
+        Generated names are cached on disk under cache_dir (default
+        ~/.cache/ai_naming_agent) so re-running on an unchanged directory
+        doesn't pay for the API call again.
+        """
         self.client = None
+        # Kept for the async client, which generate_many opens per event loop
+        self._api_key = api_key
         if api_key:
-            self.client = anthropic.Anthropic(api_key=api_key)
+            # The SDK retries 429/5xx and connection errors with backoff
+            self.client = anthropic.Anthropic(api_key=api_key, max_retries=4, timeout=30.0)
 
         # Enhanced taxonomical structure for naming convention and DATA-HOME integration
         self.naming_taxonomy = {
@@ -184,43 +210,73 @@ class DirectoryNamingAgent:
             }
         }
 
+        # Static prompt prefix, serialized once so it is byte-identical across
+        # requests. The cache breakpoint only takes effect once the prefix reaches
+        # the model's minimum cacheable length (1024 tokens for Sonnet/Opus, 2048
+        # for Haiku). At ~1.2k tokens this prompt is cached on Sonnet/Opus but NOT
+        # on the default claude-3-haiku model, where the marker is a no-op;
+        # response.usage.cache_creation_input_tokens shows whether it applied
+        self._taxonomy_json = json.dumps(self.naming_taxonomy, indent=2)
+        self._static_prompt = self._build_static_prompt()
+        self._system_blocks = [
+            {"type": "text", "text": self._static_prompt, "cache_control": {"type": "ephemeral"}}
+        ]
+
+        # One alternation per content type over its context abbreviations,
+        # longest first so overlapping abbreviations prefer the longer match
+        self._context_regex = {
+            content_type: re.compile('(' + '|'.join(
+                map(re.escape, sorted(mapping["context_mappings"], key=len, reverse=True))
+            ) + ')')
+            for content_type, mapping in self.data_home_mapping.items()
+        }
+
+        # Single-pass scanner for whole-word taxonomy keywords in snippets and file names
+        keywords = set(self.naming_taxonomy["context_indicators"]) | set(self.naming_taxonomy["content_types"])
+        self._keyword_regex = re.compile(
+            r'\b(?:' + '|'.join(map(re.escape, sorted(keywords, key=len, reverse=True))) + r')\b'
+        )
+
+        # Names already generated, keyed by (analysis hash, model, feedback):
+        # in memory for this process, and on disk across runs
+        self._name_cache: Dict[str, str] = {}
+        self._cache_path = Path(cache_dir or Path.home() / ".cache" / "ai_naming_agent") / "names"
+        # Names may be generated from a background thread while the caller generates another
+        self._cache_lock = threading.Lock()
+
     def determine_optimal_parent_directory(self, directory_name: str, data_home_root: str, source_path: str = None) -> str:
         """Determine the optimal parent directory in DATA-HOME structure."""
 
         # Special rule: If source is from ~/News/transcripts/, always go to documents/Text Documents
-        if source_path:
-            normalized_source = str(source_path).replace("\\", "/")
-            if "News/transcripts" in normalized_source or "/News/transcripts" in normalized_source:
-                print(f"🗞️  Detected News transcript source - routing to Text Documents")
-                return os.path.join(data_home_root, "filetree/roots/documents/Text Documents")
+        if source_path and "News/transcripts" in os.fspath(source_path).replace(os.sep, "/"):
+            print(f"🗞️  Detected News transcript source - routing to Text Documents")
+            return _resolve_data_home_path(data_home_root, "documents/Text Documents")
 
         # Extract content type from directory name (first part before any capitals)
-        content_type_match = re.match(r'^([a-z]+)', directory_name)
+        content_type_match = _CONTENT_TYPE_RE.match(directory_name)
         if not content_type_match:
-            return os.path.join(data_home_root, "filetree/roots/documents")  # Default fallback
+            return _resolve_data_home_path(data_home_root, "documents")  # Default fallback
 
         content_type = content_type_match.group(1)
 
         # Get mapping for this content type
         if content_type not in self.data_home_mapping:
-            return os.path.join(data_home_root, "filetree/roots/documents")  # Default fallback
+            return _resolve_data_home_path(data_home_root, "documents")  # Default fallback
 
         mapping = self.data_home_mapping[content_type]
 
         # Check for more specific context mappings
-        for context_abbrev, context_path in mapping["context_mappings"].items():
-            if context_abbrev in directory_name.lower():
-                return os.path.join(data_home_root, "filetree/roots", context_path)
+        context_match = self._context_regex[content_type].search(directory_name.lower())
+        if context_match:
+            context_path = mapping["context_mappings"][context_match.group(1)]
+            return _resolve_data_home_path(data_home_root, context_path)
 
         # Use primary path if no specific context found
-        return os.path.join(data_home_root, "filetree/roots", mapping["primary_path"])
-
-    def create_naming_prompt(self, analysis_data: Dict) -> str:
-        """Create the enhanced prompt for the AI naming agent."""
+        return _resolve_data_home_path(data_home_root, mapping["primary_path"])
 
-        taxonomy_info = json.dumps(self.naming_taxonomy, indent=2)
-
-        prompt = f"""You are a specialized directory naming agent that creates highly descriptive, content-specific directory names. Your task is to analyze the provided file structure and content snippets to generate a precise, meaningful directory name that captures the actual subject matter and context.
+    def _build_static_prompt(self) -> str:
+        """Build the invariant part of the naming prompt (role, rules, taxonomy, examples)."""
+        return f"""You are a specialized directory naming agent that creates highly descriptive, content-specific directory names. Your task is to analyze the provided file structure and content snippets to generate a precise, meaningful directory name that captures the actual subject matter and context. Respond only with the requested directory name, nothing else.
 
 NAMING REQUIREMENTS:
 1. Use camelCase syntax (e.g., transNewsIndPakEscalationAnalysis)
@@ -231,7 +287,7 @@ NAMING REQUIREMENTS:
 6. Include actual topics, names, concepts, or themes found in the content
 
 ENHANCED TAXONOMICAL STRUCTURE:
-{taxonomy_info}
+{self._taxonomy_json}
 
 NAMING PATTERN GUIDELINES:
 - Start with primary content type abbreviation (e.g., "trans", "aud", "doc")
@@ -261,104 +317,73 @@ Look for and prioritize these specific elements in the content:
 - Specific concepts, policies, or issues addressed
 - Technical terms or domain-specific language
 - Geographic locations or regions mentioned
-- Project names or initiative titles
+- Project names or initiative titles"""
 
-ANALYSIS DATA:
-Directory Path: {analysis_data['directory_path']}
+    def detect_keywords(self, analysis_data: Dict) -> list[str]:
+        """Return the distinct taxonomy keywords found in the text snippets and file tree names."""
+        names = []
 
-File Tree Structure:
-{json.dumps(analysis_data['file_tree'], indent=2)}
+        def collect(tree: Dict) -> None:
+            for name, value in tree.items():
+                names.append(name)
+                if isinstance(value, dict):
+                    collect(value)
 
-Text Snippets from Files:
-{json.dumps(analysis_data['text_snippets'], indent=2)}
+        collect(analysis_data['file_tree'])
+        # Underscores count as word characters, so split names like Interview_with_Jane.mp3 on them
+        text = "\n".join([*analysis_data['text_snippets'].values(), *names]).replace('_', ' ').lower()
+        return sorted({match.group(0) for match in self._keyword_regex.finditer(text)})
 
-Analysis Metadata:
-{json.dumps(analysis_data['analysis_metadata'], indent=2)}
+    def create_local_name(self, analysis_data: Dict) -> Optional[str]:
+        """Name a directory that holds nothing but recordings without calling the API."""
+        extensions = set()
 
-Based on this comprehensive analysis, generate ONLY the directory name (no explanation, no additional text). The name should:
-1. Start with the appropriate content type abbreviation
-2. Capture the SPECIFIC subject matter, topics, or themes from the actual content
-3. Be descriptive enough that someone could understand what the directory contains
-4. Use meaningful words rather than generic abbreviations
-5. Follow camelCase with clear, searchable terminology
+        def collect(tree: Dict) -> None:
+            for name, value in tree.items():
+                if isinstance(value, dict):
+                    collect(value)
+                elif name != "[ACCESS_DENIED]":
+                    extensions.add(os.path.splitext(name)[1].lower())
 
-Focus on what the content is actually ABOUT, not just generic categories.
+        collect(analysis_data['file_tree'])
+        if len(extensions) != 1 or not extensions <= _RECORDING_EXTENSIONS:
+            return None
 
-Directory Name:"""
+        from datetime import datetime
+        return f"audRecording{datetime.now().strftime('%Y%m%d')}"
 
-        return prompt
+    def create_naming_prompt(self, analysis_data: Dict, analysis_json: Optional[str] = None) -> Dict:
+        """Create the enhanced prompt for the AI naming agent."""
+        return self.create_naming_prompt_with_feedback(analysis_data, None, analysis_json)
 
-    def create_naming_prompt_with_feedback(self, analysis_data: Dict, feedback: str = None) -> str:
-        """Create the enhanced prompt with optional user feedback."""
+    def create_naming_prompt_with_feedback(self, analysis_data: Dict, feedback: str = None, analysis_json: Optional[str] = None, keywords: Optional[list[str]] = None) -> Dict:
+        """Create the enhanced prompt with optional user feedback.
 
-        taxonomy_info = json.dumps(self.naming_taxonomy, indent=2)
+        analysis_json may carry the payload already serialized by DirectoryAnalyzer,
+        so it isn't encoded a second time. keywords are taxonomy terms detected in
+        the snippets, passed to the model as a hint when there are at least two.
+        """
+        if analysis_json is None:
+            analysis_json = json.dumps(analysis_data, indent=2, ensure_ascii=False)
 
-        # Base prompt
-        prompt = f"""You are a specialized directory naming agent that creates highly descriptive, content-specific directory names. Your task is to analyze the provided file structure and content snippets to generate a precise, meaningful directory name that captures the actual subject matter and context.
+        prompt = ""
 
-NAMING REQUIREMENTS:
-1. Use camelCase syntax (e.g., transNewsIndPakEscalationAnalysis)
-2. Maximum 75 characters (increased from 40 for better specificity)
-3. Start with content type abbreviation, then focus on SPECIFIC CONTENT
-4. Be highly descriptive about the actual subject matter, topics, or themes
-5. Prioritize clarity and searchability over brevity
-6. Include actual topics, names, concepts, or themes found in the content
-
-ENHANCED TAXONOMICAL STRUCTURE:
-{taxonomy_info}
-
-NAMING PATTERN GUIDELINES:
-- Start with primary content type abbreviation (e.g., "trans", "aud", "doc")
-- Follow with SPECIFIC CONTENT DESCRIPTORS rather than generic context
-- Include actual subject matter: topics, themes, people, organizations, concepts
-- Add temporal markers only when they add meaningful context
-- Avoid overly generic abbreviations - be specific about what the content actually discusses
+        if keywords and len(keywords) >= 2:
+            prompt += f"""DETECTED KEYWORDS: {", ".join(keywords)}
 
-EXAMPLES OF PREFERRED NAMING PATTERNS:
-✅ GOOD (Specific and descriptive):
-- transNewsIndPakEscalationAnalysis (transcription about India-Pakistan escalation)
-- audPodClimateChangePolicy2024 (audio podcast about climate change policy)
-- docContractAcmeCorpServiceAgreement (contract document with Acme Corp)
-- transInterviewAIEthicsResearch (interview transcription about AI ethics research)
-- audMtgQuarterlyBudgetReview (audio meeting about quarterly budget review)
-
-❌ AVOID (Too generic or abbreviated):
-- audTransNewsRecPod (unclear what news topic)
-- audTransMtgStrategy2024 (unclear what strategy)
-- docProfessionalStuff (no specific content)
-- transGenericMeeting (no topic specified)
-
-CONTENT ANALYSIS FOCUS:
-Look for and prioritize these specific elements in the content:
-- Actual topics, subjects, or themes discussed
-- Names of people, organizations, or entities mentioned
-- Specific concepts, policies, or issues addressed
-- Technical terms or domain-specific language
-- Geographic locations or regions mentioned
-- Project names or initiative titles"""
+"""
 
         # Add user feedback section if provided
         if feedback:
-            prompt += f"""
-
-🔄 USER FEEDBACK FROM PREVIOUS ATTEMPT:
+            prompt += f"""🔄 USER FEEDBACK FROM PREVIOUS ATTEMPT:
 {feedback}
 
-IMPORTANT: Take this feedback seriously and adjust your naming approach accordingly. If the user didn't like something specific about the previous name or directory placement, make sure to address their concerns in this new attempt."""
+IMPORTANT: Take this feedback seriously and adjust your naming approach accordingly. If the user didn't like something specific about the previous name or directory placement, make sure to address their concerns in this new attempt.
 
-        prompt += f"""
-
-ANALYSIS DATA:
-Directory Path: {analysis_data['directory_path']}
-
-File Tree Structure:
-{json.dumps(analysis_data['file_tree'], indent=2)}
-
-Text Snippets from Files:
-{json.dumps(analysis_data['text_snippets'], indent=2)}
+"""
 
-Analysis Metadata:
-{json.dumps(analysis_data['analysis_metadata'], indent=2)}
+        prompt += f"""ANALYSIS DATA (directory path, file tree structure, text snippets from files, analysis metadata):
+{analysis_json}
 
 Based on this comprehensive analysis{"" if not feedback else " and the user feedback above"}, generate ONLY the directory name (no explanation, no additional text). The name should:
 1. Start with the appropriate content type abbreviation
@@ -372,77 +397,205 @@ Focus on what the content is actually ABOUT, not just generic categories.
 
 Directory Name:"""
 
-        return prompt
+        return {
+            "system": self._system_blocks,
+            "messages": [{"role": "user", "content": prompt}]
+        }
+
+    def _name_cache_key(self, analysis_data: Dict, model: str, feedback: str = None, analysis_json: Optional[str] = None) -> str:
+        """Key a naming request by the analysis payload, model and feedback.
 
-    def generate_directory_name(self, analysis_data: Dict, model: str = "claude-3-haiku-20240307") -> Optional[str]:
+        Hashes the caller's already-serialized analysis_json when given, so the
+        payload is only encoded again when the caller didn't serialize it.
+        """
+        if analysis_json is None:
+            analysis_json = json.dumps(analysis_data, sort_keys=True)
+        # surrogatepass: non-UTF-8 file names survive as lone surrogates
+        digest = hashlib.blake2b(analysis_json.encode('utf-8', 'surrogatepass'), digest_size=16).hexdigest()
+        return f"{digest}:{model}:{feedback or ''}"
+
+    def _cached_name(self, cache_key: str) -> Optional[str]:
+        """Look up a previously generated name in memory, then on disk."""
+        if cache_key in self._name_cache:
+            return self._name_cache[cache_key]
+
+        try:
+            with self._cache_lock, shelve.open(str(self._cache_path), flag='r') as shelf:
+                name = shelf.get(cache_key)
+        except Exception:
+            # Missing or unreadable cache file - treat as a miss
+            return None
+
+        if name:
+            self._name_cache[cache_key] = name
+        return name
+
+    def _accept_name(self, cache_key: str, response) -> Optional[str]:
+        """Validate a generated name; only valid names are remembered."""
+        generated_name = response.content[0].text.strip() if response.content else ""
+        if not self.validate_directory_name(generated_name):
+            return None
+
+        self._name_cache[cache_key] = generated_name
+        try:
+            self._cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with self._cache_lock, shelve.open(str(self._cache_path)) as shelf:
+                shelf[cache_key] = generated_name
+        except Exception as e:
+            print(f"Warning: could not update naming cache: {e}")
+        return generated_name
+
+    def _request_directory_name(self, request: Dict, model: str, cache_key: str) -> Optional[str]:
+        """Send a naming request to Claude, reusing names already generated for identical analyses."""
+        cached_name = self._cached_name(cache_key)
+        if cached_name:
+            return cached_name
+
+        response = self.client.messages.create(
+            model=model,
+            max_tokens=75,
+            temperature=0.3,
+            **request
+        )
+        return self._accept_name(cache_key, response)
+
+    async def _request_directory_name_async(self, async_client: anthropic.AsyncAnthropic, request: Dict, model: str, cache_key: str) -> Optional[str]:
+        """Async counterpart of _request_directory_name."""
+        cached_name = self._cached_name(cache_key)
+        if cached_name:
+            return cached_name
+
+        response = await async_client.messages.create(
+            model=model,
+            max_tokens=75,
+            temperature=0.3,
+            **request
+        )
+        return self._accept_name(cache_key, response)
+
+    def _report_api_error(self, error: Exception) -> None:
+        """Explain why naming fell back after the SDK gave up retrying."""
+        if isinstance(error, anthropic.RateLimitError):
+            print(f"Anthropic API rate limit still exceeded after retries: {error}")
+        elif isinstance(error, anthropic.APIStatusError):
+            print(f"Anthropic API returned an error ({error.status_code}): {error}")
+        elif isinstance(error, anthropic.APIConnectionError):
+            print(f"Could not reach the Anthropic API: {error}")
+        else:
+            # e.g. APIResponseValidationError - a response the SDK couldn't parse
+            print(f"Anthropic API request failed: {error}")
+
+    def _prepare_naming_request(self, analysis_data: Dict, feedback: str = None, analysis_json: Optional[str] = None) -> tuple[Optional[str], Optional[Dict]]:
+        """Return (local_name, None) when no API call is needed, else (None, request)."""
+        # Cheap pre-pass: directories with no namable content and only
+        # recordings get a deterministic name without an API round-trip
+        keywords = self.detect_keywords(analysis_data)
+        if not keywords and not feedback:
+            local_name = self.create_local_name(analysis_data)
+            if local_name:
+                return local_name, None
+
+        return None, self.create_naming_prompt_with_feedback(analysis_data, feedback, analysis_json, keywords)
+
+    def generate_directory_name(self, analysis_data: Dict, model: str = "claude-3-haiku-20240307", analysis_json: Optional[str] = None) -> Optional[str]:
         """Generate directory name using AI analysis."""
+        return self.generate_directory_name_with_feedback(analysis_data, None, model, analysis_json)
+
+    def generate_directory_name_with_feedback(self, analysis_data: Dict, feedback: str = None, model: str = "claude-3-haiku-20240307", analysis_json: Optional[str] = None) -> Optional[str]:
+        """Generate directory name using AI analysis with optional user feedback."""
         try:
+            local_name, request = self._prepare_naming_request(analysis_data, feedback, analysis_json)
+            if local_name:
+                return local_name
+
             if not self.client:
                 print("No Anthropic API client available. Using fallback naming.")
                 return self.create_fallback_name(analysis_data)
 
-            prompt = self.create_naming_prompt(analysis_data)
-
-            response = self.client.messages.create(
-                model=model,
-                max_tokens=75,
-                temperature=0.3,
-                system="You are a specialized directory naming agent. Respond only with the requested directory name, nothing else.",
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
+            generated_name = self._request_directory_name(
+                request, model, self._name_cache_key(analysis_data, model, feedback, analysis_json)
             )
 
-            generated_name = response.content[0].text.strip()
+            return generated_name or self.create_fallback_name(analysis_data)
 
-            # Validate the generated name
-            if self.validate_directory_name(generated_name):
-                return generated_name
-            else:
-                return self.create_fallback_name(analysis_data)
-
-        except Exception as e:
-            print(f"Error generating directory name: {e}")
+        except anthropic.APIError as e:
+            self._report_api_error(e)
             return self.create_fallback_name(analysis_data)
 
-    def generate_directory_name_with_feedback(self, analysis_data: Dict, feedback: str = None, model: str = "claude-3-haiku-20240307") -> Optional[str]:
-        """Generate directory name using AI analysis with optional user feedback."""
-        try:
-            if not self.client:
-                print("No Anthropic API client available. Using fallback naming.")
-                return self.create_fallback_name(analysis_data)
+    def try_generate_directory_name(self, analysis_data: Dict, feedback: str = None, model: str = "claude-3-haiku-20240307", analysis_json: Optional[str] = None) -> Optional[str]:
+        """Generate a name without printing or falling back; None if it couldn't be generated.
 
-            prompt = self.create_naming_prompt_with_feedback(analysis_data, feedback)
+        For background callers whose output would interleave with the foreground.
+        """
+        local_name, request = self._prepare_naming_request(analysis_data, feedback, analysis_json)
+        if local_name:
+            return local_name
+        if not self.client:
+            return None
 
-            response = self.client.messages.create(
-                model=model,
-                max_tokens=75,
-                temperature=0.3,
-                system="You are a specialized directory naming agent. Respond only with the requested directory name, nothing else.",
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
+        try:
+            return self._request_directory_name(
+                request, model, self._name_cache_key(analysis_data, model, feedback, analysis_json)
             )
+        except anthropic.APIError:
+            return None
 
-            generated_name = response.content[0].text.strip()
+    async def generate_directory_name_async(self, analysis_data: Dict, feedback: str = None, model: str = "claude-3-haiku-20240307", analysis_json: Optional[str] = None, async_client: Optional[anthropic.AsyncAnthropic] = None) -> Optional[str]:
+        """Generate directory name without blocking, for naming many directories concurrently.
 
-            # Validate the generated name
-            if self.validate_directory_name(generated_name):
-                return generated_name
-            else:
+        async_client must belong to the running event loop; without one the
+        fallback name is used.
+        """
+        try:
+            local_name, request = self._prepare_naming_request(analysis_data, feedback, analysis_json)
+            if local_name:
+                return local_name
+
+            if not async_client:
+                print("No Anthropic API client available. Using fallback naming.")
                 return self.create_fallback_name(analysis_data)
 
-        except Exception as e:
-            print(f"Error generating directory name: {e}")
+            generated_name = await self._request_directory_name_async(
+                async_client, request, model, self._name_cache_key(analysis_data, model, feedback, analysis_json)
+            )
+
+            return generated_name or self.create_fallback_name(analysis_data)
+
+        except anthropic.APIError as e:
+            self._report_api_error(e)
             return self.create_fallback_name(analysis_data)
 
-    def generate_directory_name_and_path(self, analysis_data: Dict, data_home_root: str, source_path: str = None, model: str = "claude-3-haiku-20240307") -> tuple[Optional[str], Optional[str]]:
+    def generate_many(self, payloads: List[Dict], model: str = "claude-3-haiku-20240307", max_concurrency: int = 8) -> List[Optional[str]]:
+        """Generate names for many analysis payloads concurrently, in input order."""
+        async def generate_all(async_client: Optional[anthropic.AsyncAnthropic]) -> List[Optional[str]]:
+            # Bound in-flight requests to stay within API rate limits
+            semaphore = asyncio.Semaphore(max_concurrency)
+
+            async def generate_one(analysis_data: Dict) -> Optional[str]:
+                async with semaphore:
+                    return await self.generate_directory_name_async(
+                        analysis_data, model=model, async_client=async_client
+                    )
+
+            return await asyncio.gather(*(generate_one(payload) for payload in payloads))
+
+        async def run() -> List[Optional[str]]:
+            if not self._api_key:
+                return await generate_all(None)
+            # A fresh client per asyncio.run(): pooled connections are bound to the
+            # loop that opened them and fail once that loop is closed
+            async with anthropic.AsyncAnthropic(api_key=self._api_key, max_retries=4, timeout=30.0) as async_client:
+                return await generate_all(async_client)
+
+        return asyncio.run(run())
+
+    def generate_directory_name_and_path(self, analysis_data: Dict, data_home_root: str, source_path: str = None, model: str = "claude-3-haiku-20240307", analysis_json: Optional[str] = None) -> tuple[Optional[str], Optional[str]]:
         """Generate directory name and determine optimal parent path."""
-        return self.generate_directory_name_and_path_with_feedback(analysis_data, data_home_root, source_path, feedback=None, model=model)
+        return self.generate_directory_name_and_path_with_feedback(analysis_data, data_home_root, source_path, feedback=None, model=model, analysis_json=analysis_json)
 
-    def generate_directory_name_and_path_with_feedback(self, analysis_data: Dict, data_home_root: str, source_path: str = None, feedback: str = None, model: str = "claude-3-haiku-20240307") -> tuple[Optional[str], Optional[str]]:
+    def generate_directory_name_and_path_with_feedback(self, analysis_data: Dict, data_home_root: str, source_path: str = None, feedback: str = None, model: str = "claude-3-haiku-20240307", analysis_json: Optional[str] = None) -> tuple[Optional[str], Optional[str]]:
         """Generate directory name and determine optimal parent path with optional feedback."""
-        directory_name = self.generate_directory_name_with_feedback(analysis_data, feedback, model)
+        directory_name = self.generate_directory_name_with_feedback(analysis_data, feedback, model, analysis_json)
         if not directory_name:
             return None, None
 
@@ -456,7 +609,7 @@ Directory Name:"""
             return False
 
         # Check camelCase pattern (starts with lowercase, contains only alphanumeric)
-        if not re.match(r'^[a-z][a-zA-Z0-9]*$', name):
+        if not _VALID_NAME_RE.match(name):
             return False
 
         return True
@@ -7,106 +7,190 @@ text snippets for AI analysis.
 import os
 import mimetypes
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterable, List, Tuple, Optional
 import json
 
+# orjson serializes the analysis payload in C when available
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+_READABLE_EXTS = frozenset({
+    '.txt', '.md', '.py', '.js', '.html', '.css', '.json', '.xml',
+    '.yaml', '.yml', '.cfg', '.ini', '.log', '.csv', '.tsv'
+})
+
 class DirectoryAnalyzer:
     def __init__(self):
-        self.readable_extensions = {
-            '.txt', '.md', '.py', '.js', '.html', '.css', '.json', '.xml',
-            '.yaml', '.yml', '.cfg', '.ini', '.log', '.csv', '.tsv'
-        }
+        self.readable_extensions = _READABLE_EXTS
         self.max_snippet_length = 500  # Increased from 200 for better analysis
         self.max_files_to_analyze = 25  # Increased from 20
         self.lines_to_extract = 10  # Increased from 5
 
+        # Per-directory results of the initial scan, reused by retry passes:
+        # {"file_tree": ..., "files": [(relative_path, path)], "snippets": {extract_from_end: ...}}
+        self._scan_cache: Dict[str, Dict] = {}
+
     def create_file_tree(self, directory: Path, max_depth: int = 3) -> Dict:
         """Create a hierarchical file tree structure."""
-        def build_tree(path: Path, current_depth: int = 0) -> Dict:
-            if current_depth > max_depth:
-                return {"...": "max_depth_reached"}
-
-            tree = {}
-            try:
-                items = sorted(path.iterdir(), key=lambda x: (x.is_file(), x.name.lower()))
-                for item in items:
-                    if item.is_dir():
-                        tree[f"{item.name}/"] = build_tree(item, current_depth + 1)
-                    else:
-                        # Include file size and extension info
-                        try:
-                            size = item.stat().st_size
-                            size_str = self.format_file_size(size)
-                            tree[item.name] = f"{size_str} | {item.suffix or 'no_ext'}"
-                        except:
-                            tree[item.name] = "unknown_size"
-            except PermissionError:
-                tree["[ACCESS_DENIED]"] = "permission_error"
-
-            return tree
-
-        return build_tree(directory)
+        root = str(directory)
+        tree = {}
+        # Directory path -> (its dict in the tree, its depth below the root)
+        nodes = {root: (tree, 0)}
+
+        def on_error(error: OSError) -> None:
+            node = nodes.get(error.filename)
+            if node is not None and isinstance(error, PermissionError):
+                node[0]["[ACCESS_DENIED]"] = "permission_error"
+
+        # os.walk does the scandir work in C; pruning dirnames stops descent at max_depth
+        for dirpath, dirnames, filenames in os.walk(root, onerror=on_error, followlinks=True):
+            node, depth = nodes[dirpath]
+
+            dirnames.sort(key=str.lower)
+            for name in dirnames:
+                if depth >= max_depth:
+                    node[f"{name}/"] = {"...": "max_depth_reached"}
+                else:
+                    child = {}
+                    node[f"{name}/"] = child
+                    nodes[os.path.join(dirpath, name)] = (child, depth + 1)
+            if depth >= max_depth:
+                dirnames[:] = []
+
+            for name in sorted(filenames, key=str.lower):
+                # Include file size and extension info
+                try:
+                    size = os.stat(os.path.join(dirpath, name)).st_size
+                    size_str = self.format_file_size(size)
+                    node[name] = f"{size_str} | {Path(name).suffix or 'no_ext'}"
+                except OSError:
+                    node[name] = "unknown_size"
+
+        return tree
 
     def format_file_size(self, size_bytes: int) -> str:
         """Format file size in human readable format."""
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if size_bytes < 1024.0:
-                return f"{size_bytes:.1f}{unit}"
-            size_bytes /= 1024.0
-        return f"{size_bytes:.1f}TB"
-
-    def extract_text_snippets(self, directory: Path, extract_from_end: bool = False) -> Dict[str, str]:
-        """Extract brief text snippets from readable files."""
+        if size_bytes < 1024:
+            return f"{size_bytes:.1f}B"
+        # Each unit step is 2**10, so the bit length picks the unit without a loop
+        unit_index = min((size_bytes.bit_length() - 1) // 10, 4)
+        return f"{size_bytes / (1 << (unit_index * 10)):.1f}{_SIZE_UNITS[unit_index]}"
+
+    def _iter_files(self, root: str, prefix: str = ""):
+        """Recursively yield (relative_path, path) for files with a readable extension.
+
+        A directory's own files come before its subdirectories' (the order
+        Path.rglob used), so a large subdirectory can't crowd them out of the
+        max_files_to_analyze budget.
+        """
+        subdirectories = []
+        try:
+            with os.scandir(root) as entries:
+                for entry in entries:
+                    relative_path = os.path.join(prefix, entry.name)
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirectories.append((entry.path, relative_path))
+                    elif os.path.splitext(entry.name)[1].lower() in self.readable_extensions:
+                        if entry.is_file():
+                            yield relative_path, entry.path
+        except OSError:
+            # Skip directories that can't be listed
+            return
+
+        for path, relative_path in subdirectories:
+            yield from self._iter_files(path, relative_path)
+
+    def read_head(self, file_path: str) -> str:
+        """Read the first lines of a file, touching only the bytes needed for a snippet."""
+        lines = []
+        remaining = self.max_snippet_length
+        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+            # Stop at the line limit or once the snippet length is covered,
+            # without ever reading an overlong line in full
+            while len(lines) < self.lines_to_extract and remaining > 0:
+                line = f.readline(remaining)
+                if not line:
+                    break
+                lines.append(line)
+                remaining -= len(line)
+
+        snippet = ''.join(lines)
+        if len(lines) == self.lines_to_extract and snippet.endswith('\n'):
+            # The newline after the last extracted line isn't part of the snippet
+            snippet = snippet[:-1]
+        return snippet[:self.max_snippet_length]
+
+    def read_tail(self, file_path: str) -> str:
+        """Read the last lines of a file by seeking to its end instead of loading it whole."""
+        # Worst case UTF-8 is 4 bytes per character, so this always covers max_snippet_length
+        tail_bytes = self.max_snippet_length * 4
+        with open(file_path, 'rb') as f:
+            size = f.seek(0, os.SEEK_END)
+            f.seek(max(0, size - tail_bytes))
+            content = f.read().decode('utf-8', errors='ignore')
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+        lines = content.split('\n')[-self.lines_to_extract:]
+        return '\n'.join(lines)[-self.max_snippet_length:]
+
+    def extract_text_snippets(self, directory: Path, extract_from_end: bool = False,
+                              files: Optional[Iterable[Tuple[str, str]]] = None) -> Dict[str, str]:
+        """Extract brief text snippets from readable files.
+
+        files may supply (relative_path, path) pairs from an earlier scan to skip the walk.
+        """
         snippets = {}
-        file_count = 0
+        snippet_type = "end" if extract_from_end else "beginning"
 
-        for file_path in directory.rglob('*'):
-            if file_count >= self.max_files_to_analyze:
-                break
+        if files is None:
+            files = self._iter_files(str(directory))
 
-            if not file_path.is_file():
-                continue
-
-            # Check if file is readable based on extension
-            if file_path.suffix.lower() not in self.readable_extensions:
-                continue
+        for relative_path, file_path in files:
+            if len(snippets) >= self.max_files_to_analyze:
+                break
 
             try:
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-
-                    if extract_from_end:
-                        # Extract from the end of the file for retry attempts
-                        lines = content.split('\n')
-                        if len(lines) > self.lines_to_extract:
-                            # Take last N lines
-                            relevant_lines = lines[-self.lines_to_extract:]
-                        else:
-                            relevant_lines = lines
-                        snippet = '\n'.join(relevant_lines)[-self.max_snippet_length:]
-                        snippet_type = "end"
-                    else:
-                        # Extract from the beginning (default behavior)
-                        lines = content.split('\n')[:self.lines_to_extract]
-                        snippet = '\n'.join(lines)[:self.max_snippet_length]
-                        snippet_type = "beginning"
-
-                    relative_path = file_path.relative_to(directory)
-                    snippets[str(relative_path)] = f"[{snippet_type}] {snippet}"
-                    file_count += 1
-
-            except Exception as e:
+                if extract_from_end:
+                    # Extract from the end of the file for retry attempts
+                    snippet = self.read_tail(file_path)
+                else:
+                    # Extract from the beginning (default behavior)
+                    snippet = self.read_head(file_path)
+            except OSError:
                 # Skip files that can't be read
                 continue
 
-        return snippets
+            snippets[relative_path] = f"[{snippet_type}] {snippet}"
 
-    def create_analysis_payload(self, directory: Path, extract_from_end: bool = False) -> Dict:
-        """Create the complete analysis payload for AI processing."""
-        file_tree = self.create_file_tree(directory)
-        text_snippets = self.extract_text_snippets(directory, extract_from_end)
+        return snippets
 
-        return {
+    def create_analysis_payload(self, directory: Path, extract_from_end: bool = False, with_json: bool = False):
+        """Create the complete analysis payload for AI processing.
+
+        With with_json=True, returns a (payload, payload_json) tuple so callers can
+        reuse the serialized form for both the AI prompt and the debug dump.
+
+        A beginning-of-files pass always rescans the directory. End-of-files (retry)
+        passes reuse its file tree and file list, and each snippet set is only read once.
+        """
+        key = str(directory)
+        scan = self._scan_cache.get(key) if extract_from_end else None
+        if scan is None:
+            scan = {"file_tree": self.create_file_tree(directory), "files": None, "snippets": {}}
+            self._scan_cache[key] = scan
+
+        file_tree = scan["file_tree"]
+        text_snippets = scan["snippets"].get(extract_from_end)
+        if text_snippets is None:
+            text_snippets = self.extract_text_snippets(directory, extract_from_end, scan["files"])
+            scan["snippets"][extract_from_end] = text_snippets
+            if scan["files"] is None:
+                scan["files"] = [(relative_path, os.path.join(key, relative_path)) for relative_path in text_snippets]
+
+        payload = {
             "directory_path": str(directory),
             "file_tree": file_tree,
             "text_snippets": text_snippets,
@@ -119,7 +203,21 @@ class DirectoryAnalyzer:
             }
         }
 
-    def create_retry_analysis_payload(self, directory: Path) -> Dict:
+        if with_json:
+            return payload, self.serialize_payload(payload)
+        return payload
+
+    def serialize_payload(self, payload: Dict) -> str:
+        """Serialize an analysis payload as indented, non-ASCII-preserving JSON."""
+        if orjson is not None:
+            try:
+                return orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode('utf-8')
+            except TypeError:
+                # orjson.JSONEncodeError - e.g. non-UTF-8 file names kept as lone surrogates
+                pass
+        return json.dumps(payload, indent=2, ensure_ascii=False)
+
+    def create_retry_analysis_payload(self, directory: Path, with_json: bool = False):
         """Create analysis payload for retry attempts, focusing on end of files."""
         print("🔍 Analyzing file endings for more specific context...")
-        return self.create_analysis_payload(directory, extract_from_end=True)
+        return self.create_analysis_payload(directory, extract_from_end=True, with_json=with_json)
@@ -10,15 +10,55 @@ import subprocess
 import shutil
 from pathlib import Path
 from typing import List, Optional, Tuple
-import whisper
+from concurrent.futures import ThreadPoolExecutor
+import functools
 import json
 from datetime import datetime
 
+# Prefer faster-whisper (CTranslate2) when installed, fall back to openai-whisper
+try:
+    from faster_whisper import WhisperModel
+    from faster_whisper.audio import decode_audio
+except ImportError:
+    WhisperModel = None
+    import whisper
+
+_AUDIO_EXTS = frozenset({'.mp3', '.wav', '.m4a', '.flac', '.aac', '.ogg', '.wma'})
+
+# Recordings larger than this on disk aren't pre-decoded: a decoded waveform is
+# 64 KB per second of audio, and prefetching holds two files' worth at once
+_PREFETCH_MAX_BYTES = 50 * 1024 * 1024
+
+
+def detect_device() -> str:
+    """Return "cuda" when a GPU is available, otherwise "cpu"."""
+    try:
+        import torch
+        return "cuda" if torch.cuda.is_available() else "cpu"
+    except ImportError:
+        try:
+            import ctranslate2
+            return "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+        except ImportError:
+            return "cpu"
+
+
+@functools.lru_cache(maxsize=4)
+def load_whisper_model(model_size: str, device: str):
+    """Load a Whisper model once per (size, device) and share it across AudioProcessor instances."""
+    if WhisperModel is not None:
+        # FP16 on GPU, int8 quantization on CPU
+        compute_type = "float16" if device == "cuda" else "int8"
+        return WhisperModel(model_size, device=device, compute_type=compute_type)
+    return whisper.load_model(model_size, device=device)
+
+
 class AudioProcessor:
     def __init__(self, whisper_model_size: str = "base"):
         """Initialize the audio processor with Whisper model."""
-        self.audio_extensions = {'.mp3', '.wav', '.m4a', '.flac', '.aac', '.ogg', '.wma'}
-        self.whisper_model = whisper.load_model(whisper_model_size)
+        self.audio_extensions = _AUDIO_EXTS
+        self.device = detect_device()
+        self.whisper_model = load_whisper_model(whisper_model_size, self.device)
 
     def detect_audio_files(self, directory: str) -> List[Path]:
         """Detect all audio files in the given directory."""
@@ -27,9 +67,11 @@ class AudioProcessor:
             raise FileNotFoundError(f"Directory {directory} does not exist")
 
         audio_files = []
-        for file_path in directory_path.iterdir():
-            if file_path.is_file() and file_path.suffix.lower() in self.audio_extensions:
-                audio_files.append(file_path)
+        with os.scandir(directory_path) as entries:
+            for entry in entries:
+                # Check the extension on the entry name before touching the file type
+                if os.path.splitext(entry.name)[1].lower() in self.audio_extensions and entry.is_file():
+                    audio_files.append(Path(entry.path))
 
         return audio_files
 
@@ -58,16 +100,66 @@ class AudioProcessor:
         subdir_path.mkdir(exist_ok=True)
         return subdir_path
 
-    def transcribe_audio(self, audio_file: Path) -> str:
-        """Transcribe audio file using Whisper."""
+    def load_audio(self, audio_file: Path):
+        """Decode and resample an audio file to 16 kHz mono for Whisper."""
+        if WhisperModel is not None:
+            return decode_audio(str(audio_file))
+        return whisper.load_audio(str(audio_file))
+
+    def prefetch_audio(self, audio_file: Path):
+        """Pre-decode audio_file, or return None for large files Whisper should decode itself."""
+        if audio_file.stat().st_size > _PREFETCH_MAX_BYTES:
+            return None
+        return self.load_audio(audio_file)
+
+    def iter_transcription(self, audio_file: Path, audio=None):
+        """Yield the transcription text segment by segment, optionally from pre-decoded audio."""
+        source = audio if audio is not None else str(audio_file)
+        if WhisperModel is not None:
+            # faster-whisper yields segments lazily, as they are transcribed
+            segments, _ = self.whisper_model.transcribe(source)
+            for segment in segments:
+                yield segment.text
+        else:
+            result = self.whisper_model.transcribe(source, fp16=self.device == "cuda")
+            for segment in result["segments"]:
+                yield segment["text"]
+
+    def transcribe_audio(self, audio_file: Path, audio=None) -> str:
+        """Transcribe audio file using Whisper, optionally from pre-decoded audio."""
         print(f"Transcribing {audio_file.name}...")
         try:
-            result = self.whisper_model.transcribe(str(audio_file))
-            return result["text"]
+            return "".join(self.iter_transcription(audio_file, audio))
         except Exception as e:
             print(f"Error transcribing {audio_file.name}: {e}")
             return ""
 
+    def transcribe_to_file(self, audio_file: Path, output_path: Path, audio=None) -> bool:
+        """Stream a transcription to output_path; returns False if nothing was transcribed.
+
+        Text goes to a sibling temp file that only replaces output_path once
+        transcription succeeds, so an existing transcript survives a failure.
+        """
+        print(f"Transcribing {audio_file.name}...")
+        temp_path = output_path.with_name(output_path.name + ".part")
+        written = False
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                for text in self.iter_transcription(audio_file, audio):
+                    if text:
+                        f.write(text)
+                        written = True
+            if written:
+                os.replace(temp_path, output_path)
+        except Exception as e:
+            print(f"Error transcribing {audio_file.name}: {e}")
+            written = False
+        finally:
+            if not written:
+                # Don't leave empty or partial transcripts behind
+                temp_path.unlink(missing_ok=True)
+        return written
+
     def save_transcription(self, transcription: str, output_path: Path) -> None:
         """Save transcription to text file."""
         with open(output_path, 'w', encoding='utf-8') as f:
@@ -97,21 +189,27 @@ class AudioProcessor:
             parent_dir = Path(directory)
             subdir = self.create_subdirectory(parent_dir)
 
-            # Step 4: Process each audio file
-            for audio_file in audio_files:
-                # Transcribe
-                transcription = self.transcribe_audio(audio_file)
-
-                if transcription:
-                    # Save transcription
+            # Step 4: Process each audio file, decoding the next file's audio
+            # in the background while the current one is transcribed (small files only)
+            with ThreadPoolExecutor(max_workers=1) as loader:
+                pending_audio = loader.submit(self.prefetch_audio, audio_files[0])
+                for index, audio_file in enumerate(audio_files):
+                    try:
+                        audio = pending_audio.result()
+                    except Exception:
+                        audio = None  # Let Whisper decode the file itself
+                    if index + 1 < len(audio_files):
+                        pending_audio = loader.submit(self.prefetch_audio, audio_files[index + 1])
+
+                    # Transcribe, writing segments to the transcript as they arrive
                     transcript_filename = f"{audio_file.stem}_transcript.txt"
                     transcript_path = subdir / transcript_filename
-                    self.save_transcription(transcription, transcript_path)
-                    print(f"Saved transcription: {transcript_path}")
+                    if self.transcribe_to_file(audio_file, transcript_path, audio):
+                        print(f"Saved transcription: {transcript_path}")
 
-                # Move original audio file
-                self.move_audio_file(audio_file, subdir)
-                print(f"Moved audio file: {audio_file.name}")
+                    # Move original audio file
+                    self.move_audio_file(audio_file, subdir)
+                    print(f"Moved audio file: {audio_file.name}")
 
             print(f"\nProcessing complete. Files moved to: {subdir}")
             return subdir
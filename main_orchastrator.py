@@ -3,32 +3,132 @@
 Main orchestrator that coordinates all components of the system.
 """
 
+import io
 import sys
 import os
+import stat
 from pathlib import Path
-import json
 import shutil
 import csv
+import errno
+import re
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass
 from datetime import datetime
+from typing import Optional
 
 # Import the other components of the system
 from main_audio_processor import AudioProcessor
 from directory_analyzer import DirectoryAnalyzer
 from ai_naming_agent import DirectoryNamingAgent
+# Progress output is buffered here and written out at step boundaries,
+# so a run issues a handful of writes instead of one per line
+_out = io.StringIO()
+
+
+def say(*args, **kwargs) -> None:
+    """Queue a line of progress output."""
+    print(*args, file=_out, **kwargs)
+
+
+def flush_output() -> None:
+    """Write any queued progress output to stdout."""
+    if _out.tell():
+        sys.stdout.write(_out.getvalue())
+        sys.stdout.flush()
+        _out.seek(0)
+        _out.truncate()
+
+
+def ask(prompt: str) -> str:
+    """Show queued output, then read a line from the user."""
+    flush_output()
+    return input(prompt)
+
+# Analysis payloads are only dumped next to the data when AI_ORG_DEBUG is set
+_DEBUG = bool(os.environ.get('AI_ORG_DEBUG'))
+
+# Renames are flushed to disk (parent directory fsync) when AI_ORG_DURABLE is set
+_DURABLE = bool(os.environ.get('AI_ORG_DURABLE'))
+
+# A/B testing log lives next to this script
+_SCRIPT_DIR = Path(__file__).resolve().parent
+_LOG_FILE = _SCRIPT_DIR / "naming_ab_testing_log.csv"
+
+# Column order of the A/B testing log (documented in csv_structure_docs.md)
+_LOG_FIELDS = (
+    'timestamp', 'session_id', 'attempt_number', 'source_path', 'generated_name',
+    'generated_name_length', 'optimal_parent_path', 'user_action', 'user_feedback',
+    'final_destination', 'files_analyzed', 'has_audio_files', 'source_is_news_transcript',
+    'content_type_prefix', 'feedback_length', 'feedback_categories'
+)
+
+# Default filesystems on macOS and Windows ignore case, so "transMtg" collides with "transmtg"
+_CASE_INSENSITIVE_FS = sys.platform in ('darwin', 'win32')
+
+# Feedback used when the user doesn't type any
+_DEFAULT_FEEDBACK = "Please make the name more specific and descriptive"
+
+# Feedback categories in reporting order, with the keywords that signal each
+_FEEDBACK_CATEGORIES = {
+    'specificity': ('generic', 'specific', 'vague', 'unclear'),           # Content specificity
+    'length': ('long', 'short', 'length', 'brief', 'verbose'),            # Length concerns
+    'location': ('location', 'directory', 'path', 'folder', 'place'),     # Location/path concerns
+    'content_focus': ('topic', 'subject', 'focus', 'about', 'theme'),     # Content focus
+    'abbreviations': ('abbreviation', 'abbrev', 'short', 'expand'),       # Abbreviation concerns
+    'missing_info': ('missing', 'include', 'add', 'mention'),             # Missing information
+    'context': ('context', 'background', 'situation'),                    # Context concerns
+}
+
+# Keyword -> categories it signals ("short" counts for both length and abbreviations)
+_FEEDBACK_KEYWORD_CATEGORIES = {}
+for _category, _keywords in _FEEDBACK_CATEGORIES.items():
+    for _keyword in _keywords:
+        _FEEDBACK_KEYWORD_CATEGORIES.setdefault(_keyword, []).append(_category)
+
+# Lookahead so overlapping keywords (e.g. "abbrev" inside "abbreviation") are all seen
+_FEEDBACK_KEYWORD_RE = re.compile(
+    '(?=(' + '|'.join(map(re.escape, sorted(_FEEDBACK_KEYWORD_CATEGORIES, key=len, reverse=True))) + '))'
+)
+
+
+@dataclass(frozen=True)
+class Config:
+    """Settings resolved once at startup and passed down to each step."""
+    data_home: Optional[str]
+    api_key: Optional[str]
+    debug: bool
+    durable: bool
+
 
 def main():
     """Main function that orchestrates the entire process."""
+    try:
+        _run()
+    finally:
+        # Emit anything still queued, including on sys.exit() paths
+        flush_output()
+
+
+def _run():
+    """Run the audio, analysis, naming and placement steps."""
+    # Outcomes reported in the closing summary
+    optimal_parent_path = None
+    new_directory_name = None
+    final_location = None
+
     if len(sys.argv) != 2:
-        print("Usage: python main_orchastrator.py <directory_path>")
-        print("  directory_path: Path to directory containing audio files")
-        print("  DATA_HOME environment variable should be set to your DATA-HOME root path")
-        print("")
-        print("Example:")
-        print("  # Process current directory")
-        print("  python main_orchastrator.py .")
-        print("")
-        print("  # Process specific directory")
-        print("  python main_orchastrator.py /path/to/audio/files")
+        say("Usage: python main_orchastrator.py <directory_path>")
+        say("  directory_path: Path to directory containing audio files")
+        say("  DATA_HOME environment variable should be set to your DATA-HOME root path")
+        say("")
+        say("Example:")
+        say("  # Process current directory")
+        say("  python main_orchastrator.py .")
+        say("")
+        say("  # Process specific directory")
+        say("  python main_orchastrator.py /path/to/audio/files")
         sys.exit(1)
 
     directory_path = sys.argv[1]
@@ -36,35 +136,46 @@ def main():
     # Get DATA-HOME from environment variable
     data_home_root = os.getenv('DATA_HOME')
     if not data_home_root:
-        print("Warning: DATA_HOME environment variable not set.")
-        print("Please set DATA_HOME to your DATA-HOME root directory:")
-        print("  export DATA_HOME=/path/to/your/DATA-HOME")
-        print("Proceeding without DATA-HOME integration...")
+        say("Warning: DATA_HOME environment variable not set.")
+        say("Please set DATA_HOME to your DATA-HOME root directory:")
+        say("  export DATA_HOME=/path/to/your/DATA-HOME")
+        say("Proceeding without DATA-HOME integration...")
         data_home_root = None
     else:
-        print(f"Using DATA-HOME: {data_home_root}")
-
-    # Validate directory exists
-    if not os.path.exists(directory_path):
-        print(f"Error: Directory '{directory_path}' does not exist.")
+        say(f"Using DATA-HOME: {data_home_root}")
+
+    # Validate directory exists (one stat, reused for the type check)
+    try:
+        directory_stat = os.stat(directory_path)
+    except OSError:
+        # Missing, a path through a file, or unreachable - all count as not existing
+        say(f"Error: Directory '{directory_path}' does not exist.")
+        sys.exit(1)
+    if not stat.S_ISDIR(directory_stat.st_mode):
+        say(f"Error: '{directory_path}' is not a directory.")
         sys.exit(1)
 
     # Validate DATA-HOME structure exists if DATA_HOME is set
-    if data_home_root:
-        filetree_path = os.path.join(data_home_root, "filetree/roots")
-        if not os.path.exists(filetree_path):
-            print(f"Warning: DATA-HOME structure not found at '{filetree_path}'")
-            print("Expected structure: DATA_HOME/filetree/roots/")
-            print("Proceeding without DATA-HOME integration...")
-            data_home_root = None
+    data_home = Path(data_home_root) if data_home_root else None
+    if data_home:
+        filetree_path = data_home / "filetree" / "roots"
+        if filetree_path.is_dir():
+            say(f"✅ DATA-HOME structure validated at: {filetree_path}")
         else:
-            print(f"✅ DATA-HOME structure validated at: {filetree_path}")
+            say(f"Warning: DATA-HOME structure not found at '{filetree_path}'")
+            say("Expected structure: DATA_HOME/filetree/roots/")
+            say("Proceeding without DATA-HOME integration...")
+            data_home_root = data_home = None
+
+    cfg = Config(data_home=data_home_root, api_key=os.getenv('ANTHROPIC_API_KEY'), debug=_DEBUG,
+                 durable=_DURABLE)
 
-    print("🎵 Audio Processing and Directory Organization System")
-    print("=" * 50)
+    say("🎵 Audio Processing and Directory Organization System")
+    say("=" * 50)
 
     # Step 1: Process audio files
-    print("\n📁 Step 1: Audio Detection and Transcription")
+    say("\n📁 Step 1: Audio Detection and Transcription")
+    flush_output()
     audio_processor = AudioProcessor()
     processed_subdir = audio_processor.process_directory(directory_path)
 
@@ -80,7 +191,7 @@ def main():
         )
     else:
         # No audio files found, ask if user wants to analyze directory anyway
-        print(f"\nNo audio files found in {directory_path}")
+        say(f"\nNo audio files found in {directory_path}")
         proceed_with_analysis = prompt_user_consent(
             "\n🔍 Would you like to analyze and organize this directory anyway?",
             "This will analyze the existing directory structure and content to generate an intelligent name and optimal placement."
@@ -89,31 +200,33 @@ def main():
             target_directory = Path(directory_path)
 
     if not proceed_with_analysis:
-        print("Directory analysis cancelled by user.")
+        say("Directory analysis cancelled by user.")
         if processed_subdir:
-            print(f"Audio processing completed. Files are located at: {processed_subdir}")
+            say(f"Audio processing completed. Files are located at: {processed_subdir}")
         sys.exit(0)
 
     if not target_directory:
-        print("No target directory available for analysis.")
+        say("No target directory available for analysis.")
         sys.exit(0)
 
     # Step 2: Analyze directory structure
-    print("\n🔍 Step 2: Directory Analysis")
+    say("\n🔍 Step 2: Directory Analysis")
+    flush_output()
     analyzer = DirectoryAnalyzer()
-    analysis_data = analyzer.create_analysis_payload(target_directory)
+    analysis_data, analysis_json = analyzer.create_analysis_payload(target_directory, with_json=True)
 
-    # Save analysis data for debugging
-    analysis_file = target_directory / "analysis_data.json"
-    with open(analysis_file, 'w', encoding='utf-8') as f:
-        json.dump(analysis_data, f, indent=2, ensure_ascii=False)
-    print(f"Analysis data saved to: {analysis_file}")
+    if cfg.debug:
+        # Save analysis data for debugging
+        analysis_file = target_directory / "analysis_data.json"
+        analysis_file.write_text(analysis_json, encoding='utf-8')
+        say(f"Analysis data saved to: {analysis_file}")
 
     # Display analysis summary to user
-    print(f"\n📊 Analysis Summary:")
-    print(f"  • Files analyzed: {analysis_data['analysis_metadata']['total_files_analyzed']}")
-    print(f"  • Directory depth: {analysis_data['analysis_metadata']['max_depth']}")
-    print(f"  • Target directory: {target_directory}")
+    meta = analysis_data['analysis_metadata']
+    say(f"\n📊 Analysis Summary:")
+    say(f"  • Files analyzed: {meta['total_files_analyzed']}")
+    say(f"  • Directory depth: {meta['max_depth']}")
+    say(f"  • Target directory: {target_directory}")
 
     # Ask for consent to proceed with AI naming
     proceed_with_naming = prompt_user_consent(
@@ -122,21 +235,20 @@ def main():
     )
 
     if not proceed_with_naming:
-        print("AI naming cancelled by user.")
-        print(f"Analysis complete. Directory remains at: {target_directory}")
+        say("AI naming cancelled by user.")
+        say(f"Analysis complete. Directory remains at: {target_directory}")
         sys.exit(0)
 
     # Step 3: Generate intelligent directory name
-    print("\n🤖 Step 3: AI-Powered Directory Naming")
+    say("\n🤖 Step 3: AI-Powered Directory Naming")
 
     # Check if Anthropic API key is available
-    api_key = os.getenv('ANTHROPIC_API_KEY')
-    if not api_key:
-        print("Warning: ANTHROPIC_API_KEY not found in environment variables.")
-        print("Please set your Anthropic API key to use AI naming features.")
-        print("Using fallback naming method...")
+    if not cfg.api_key:
+        say("Warning: ANTHROPIC_API_KEY not found in environment variables.")
+        say("Please set your Anthropic API key to use AI naming features.")
+        say("Using fallback naming method...")
 
-    naming_agent = DirectoryNamingAgent(api_key)
+    naming_agent = DirectoryNamingAgent(cfg.api_key)
 
     # Generate session ID for A/B testing tracking
     session_id = generate_session_id()
@@ -144,340 +256,500 @@ def main():
 
     # Create analysis summary for logging
     analysis_summary = {
-        'total_files_analyzed': analysis_data['analysis_metadata']['total_files_analyzed'],
+        'total_files_analyzed': meta['total_files_analyzed'],
         'had_audio_files': had_audio_files
     }
 
-    # Retry loop for directory naming
-    max_retries = 3
-    retry_count = 0
-    feedback_history = []
-    current_analysis_data = analysis_data  # Keep track of current analysis
-
-    while retry_count <= max_retries:
-        if data_home_root:
-            # Generate name and determine optimal placement
-            # Pass the original directory path for source-based routing rules
-            if retry_count == 0:
-                # First attempt - no feedback, use initial analysis
-                new_directory_name, optimal_parent_path = naming_agent.generate_directory_name_and_path(
-                    current_analysis_data, data_home_root, source_path=directory_path
-                )
-            else:
-                # Retry with feedback - create new analysis focusing on file endings
-                print(f"🔄 Retry attempt {retry_count}/{max_retries} - Re-analyzing with different approach...")
-                current_analysis_data = analyzer.create_retry_analysis_payload(target_directory)
-
-                # Save retry analysis data for debugging
-                retry_analysis_file = target_directory / f"retry_analysis_data_{retry_count}.json"
-                with open(retry_analysis_file, 'w', encoding='utf-8') as f:
-                    json.dump(current_analysis_data, f, indent=2, ensure_ascii=False)
-                print(f"Retry analysis data saved to: {retry_analysis_file}")
-
-                combined_feedback = " | ".join(feedback_history)
-                new_directory_name, optimal_parent_path = naming_agent.generate_directory_name_and_path_with_feedback(
-                    current_analysis_data, data_home_root, source_path=directory_path, feedback=combined_feedback
-                )
-        else:
-            # Fallback to original behavior without DATA-HOME integration
-            if retry_count == 0:
-                new_directory_name = naming_agent.generate_directory_name(current_analysis_data)
-            else:
-                # Retry with new analysis of file endings
-                print(f"🔄 Retry attempt {retry_count}/{max_retries} - Re-analyzing with different approach...")
-                current_analysis_data = analyzer.create_retry_analysis_payload(target_directory)
-
-                combined_feedback = " | ".join(feedback_history)
-                new_directory_name = naming_agent.generate_directory_name_with_feedback(current_analysis_data, feedback=combined_feedback)
-            optimal_parent_path = None
-
-        if not new_directory_name:
-            # Log failed generation
-            log_naming_attempt(
-                session_id=session_id,
-                attempt_number=retry_count + 1,
-                source_path=directory_path,
-                generated_name="",
-                optimal_parent=optimal_parent_path or "",
-                user_action="generation_failed",
-                feedback="",
-                analysis_summary=analysis_summary
-            )
-            print("Failed to generate directory name")
-            break
-
-        # Show the generated name and path
-        print(f"\n📝 Generated directory name: {new_directory_name}")
-        if optimal_parent_path:
-            print(f"📂 Optimal parent directory: {optimal_parent_path}")
-
-        # Show analysis type for user awareness
-        extraction_type = current_analysis_data['analysis_metadata'].get('extraction_type', 'beginning_of_files')
-        if retry_count > 0:
-            print(f"📊 Analysis focus: {extraction_type} (snippet length: {current_analysis_data['analysis_metadata']['snippet_max_length']} chars)")
-
-        # Ask user if they're satisfied with the name
-        user_choice = prompt_user_naming_satisfaction()
-
-        if user_choice == "accept":
-            # Log accepted attempt
-            log_naming_attempt(
-                session_id=session_id,
-                attempt_number=retry_count + 1,
-                source_path=directory_path,
-                generated_name=new_directory_name,
-                optimal_parent=optimal_parent_path or "",
-                user_action="accept",
-                feedback="",
-                analysis_summary=analysis_summary
-            )
-            break
-        elif user_choice == "retry" and retry_count < max_retries:
-            # Collect feedback
-            feedback = collect_user_feedback(new_directory_name, optimal_parent_path)
-            feedback_history.append(feedback)
-
-            # Log retry attempt with feedback
-            log_naming_attempt(
-                session_id=session_id,
-                attempt_number=retry_count + 1,
-                source_path=directory_path,
-                generated_name=new_directory_name,
-                optimal_parent=optimal_parent_path or "",
-                user_action="retry",
-                feedback=feedback,
-                analysis_summary=analysis_summary
+    # One log handle for the whole naming session
+    with NamingAttemptLog(_LOG_FILE) as naming_log:
+        # Retry loop for directory naming
+        max_retries = 3
+        retry_count = 0
+        feedback_history = []
+        current_analysis_data = analysis_data  # Keep track of current analysis
+        current_analysis_json = analysis_json
+
+        # The next attempt is generated speculatively, with the default feedback,
+        # while the user writes theirs; it is used if they leave the feedback empty
+        speculative_name = None
+
+        # Pick the attempt generator once, so the loop body doesn't re-check DATA-HOME
+        generate_attempt = _retry_with_datahome if cfg.data_home else _retry_local
+        dump_retry_analysis = cfg.debug and cfg.data_home is not None
+
+        while retry_count <= max_retries:
+            if retry_count > 0:
+                # Retry with feedback, using the analysis of file endings made when the user chose to retry
+                say(f"🔄 Retry attempt {retry_count}/{max_retries} - Re-analyzing with different approach...")
+
+                if dump_retry_analysis:
+                    # Save retry analysis data for debugging
+                    retry_analysis_file = target_directory / f"retry_analysis_data_{retry_count}.json"
+                    retry_analysis_file.write_text(current_analysis_json, encoding='utf-8')
+                    say(f"Retry analysis data saved to: {retry_analysis_file}")
+            flush_output()
+
+            # The first attempt has no feedback and uses the initial analysis
+            new_directory_name, optimal_parent_path = generate_attempt(
+                cfg, naming_agent, current_analysis_data, current_analysis_json, directory_path,
+                feedback=" | ".join(feedback_history) or None, pending_name=speculative_name
             )
+            speculative_name = None
 
-            retry_count += 1
-        else:
-            if retry_count >= max_retries:
-                print(f"Maximum retry attempts ({max_retries}) reached. Using current name.")
-                # Log max retries reached
+            if not new_directory_name:
+                # Log failed generation
                 log_naming_attempt(
+                    naming_log,
                     session_id=session_id,
                     attempt_number=retry_count + 1,
                     source_path=directory_path,
-                    generated_name=new_directory_name,
+                    generated_name="",
                     optimal_parent=optimal_parent_path or "",
-                    user_action="max_retries_reached",
+                    user_action="generation_failed",
                     feedback="",
                     analysis_summary=analysis_summary
                 )
-            else:
-                # Log cancellation
+                say("Failed to generate directory name")
+                break
+
+            # Show the generated name and path
+            say(f"\n📝 Generated directory name: {new_directory_name}")
+            if optimal_parent_path:
+                say(f"📂 Optimal parent directory: {optimal_parent_path}")
+
+            # Show analysis type for user awareness
+            current_meta = current_analysis_data['analysis_metadata']
+            extraction_type = current_meta.get('extraction_type', 'beginning_of_files')
+            if retry_count > 0:
+                say(f"📊 Analysis focus: {extraction_type} (snippet length: {current_meta['snippet_max_length']} chars)")
+
+            # Ask user if they're satisfied with the name
+            user_choice = prompt_user_naming_satisfaction()
+
+            if user_choice == "accept":
+                # Log accepted attempt
                 log_naming_attempt(
+                    naming_log,
                     session_id=session_id,
                     attempt_number=retry_count + 1,
                     source_path=directory_path,
                     generated_name=new_directory_name,
                     optimal_parent=optimal_parent_path or "",
-                    user_action="cancel",
+                    user_action="accept",
                     feedback="",
                     analysis_summary=analysis_summary
                 )
-            break
-
-    # Continue with the final name choice
-    if new_directory_name:
-        if data_home_root and optimal_parent_path:
-            # Show preview of final path
-            final_path = Path(optimal_parent_path) / new_directory_name
-
-            # Check for naming conflicts and show final name
-            counter = 1
-            original_new_name = new_directory_name
-            temp_final_path = final_path
-            while temp_final_path.exists():
-                conflict_name = f"{original_new_name}{counter}"
-                temp_final_path = Path(optimal_parent_path) / conflict_name
-                counter += 1
-
-            if counter > 1:
-                print(f"⚠️  Conflict detected. Final name will be: {temp_final_path.name}")
-                final_path = temp_final_path
-                new_directory_name = temp_final_path.name
-
-            # Ask for final consent to move/rename
-            proceed_with_move = prompt_user_consent(
-                f"\n📦 Would you like to move and rename the directory?",
-                f"This will move '{target_directory}' to '{final_path}'"
-            )
-
-            if not proceed_with_move:
-                print("Directory move cancelled by user.")
-                print(f"Directory remains at: {target_directory}")
-                sys.exit(0)
-
-            # NOW perform the actual operations after consent
-            try:
-                # Ensure parent directory exists
-                print(f"Creating parent directory: {optimal_parent_path}")
-                os.makedirs(optimal_parent_path, exist_ok=True)
+                break
+            elif user_choice == "retry" and retry_count < max_retries:
+                # Re-analyze focusing on file endings now, so the next attempt can be
+                # generated in the background while the user writes their feedback
+                current_analysis_data, current_analysis_json = analyzer.create_retry_analysis_payload(
+                    target_directory, with_json=True
+                )
+                if naming_agent.client:
+                    # Silent variant: nothing printed over the feedback prompt, and
+                    # a failed call is simply redone in the foreground
+                    speculative_name = _speculate(
+                        naming_agent.try_generate_directory_name,
+                        current_analysis_data,
+                        feedback=" | ".join(feedback_history + [_DEFAULT_FEEDBACK]),
+                        analysis_json=current_analysis_json
+                    )
 
-                # Move the directory
-                print(f"Moving directory from {target_directory} to {final_path}")
-                shutil.move(str(target_directory), str(final_path))
-                print(f"✅ Directory moved to optimal location: {final_path}")
-                final_location = final_path
+                # Collect feedback
+                feedback = collect_user_feedback(new_directory_name, optimal_parent_path)
+                feedback_history.append(feedback)
+                if feedback != _DEFAULT_FEEDBACK:
+                    # Real feedback given - the speculative name doesn't account for it.
+                    # The call is already in flight and can't be stopped, so this retry
+                    # pays for two API calls; its result is just ignored
+                    speculative_name = None
 
-                # Log successful move
+                # Log retry attempt with feedback
                 log_naming_attempt(
+                    naming_log,
                     session_id=session_id,
                     attempt_number=retry_count + 1,
                     source_path=directory_path,
                     generated_name=new_directory_name,
-                    optimal_parent=optimal_parent_path,
-                    user_action="moved_successfully",
-                    final_destination=str(final_path),
+                    optimal_parent=optimal_parent_path or "",
+                    user_action="retry",
+                    feedback=feedback,
                     analysis_summary=analysis_summary
                 )
-            except Exception as e:
-                print(f"Error moving directory to optimal location: {e}")
-                print("Falling back to local rename...")
 
-                # Log move failure
-                log_naming_attempt(
-                    session_id=session_id,
-                    attempt_number=retry_count + 1,
-                    source_path=directory_path,
-                    generated_name=new_directory_name,
-                    optimal_parent=optimal_parent_path,
-                    user_action="move_failed",
-                    feedback=f"Move error: {str(e)}",
-                    analysis_summary=analysis_summary
+                retry_count += 1
+            else:
+                if retry_count >= max_retries:
+                    say(f"Maximum retry attempts ({max_retries}) reached. Using current name.")
+                    # Log max retries reached
+                    log_naming_attempt(
+                        naming_log,
+                        session_id=session_id,
+                        attempt_number=retry_count + 1,
+                        source_path=directory_path,
+                        generated_name=new_directory_name,
+                        optimal_parent=optimal_parent_path or "",
+                        user_action="max_retries_reached",
+                        feedback="",
+                        analysis_summary=analysis_summary
+                    )
+                else:
+                    # Log cancellation
+                    log_naming_attempt(
+                        naming_log,
+                        session_id=session_id,
+                        attempt_number=retry_count + 1,
+                        source_path=directory_path,
+                        generated_name=new_directory_name,
+                        optimal_parent=optimal_parent_path or "",
+                        user_action="cancel",
+                        feedback="",
+                        analysis_summary=analysis_summary
+                    )
+                break
+
+        # Continue with the final name choice
+        if new_directory_name:
+            if cfg.data_home and optimal_parent_path:
+                # Show preview of final path
+                final_path = Path(optimal_parent_path) / new_directory_name
+
+                # Check for naming conflicts and show final name
+                unique_name = _unique_name(Path(optimal_parent_path), new_directory_name)
+                if unique_name != new_directory_name:
+                    say(f"⚠️  Conflict detected. Final name will be: {unique_name}")
+                    final_path = Path(optimal_parent_path) / unique_name
+                    new_directory_name = unique_name
+
+                # Ask for final consent to move/rename
+                proceed_with_move = prompt_user_consent(
+                    f"\n📦 Would you like to move and rename the directory?",
+                    f"This will move '{target_directory}' to '{final_path}'"
                 )
 
-                # Fallback to local rename
+                if not proceed_with_move:
+                    say("Directory move cancelled by user.")
+                    say(f"Directory remains at: {target_directory}")
+                    sys.exit(0)
+
+                # NOW perform the actual operations after consent
+                try:
+                    # Ensure parent directory exists
+                    say(f"Creating parent directory: {optimal_parent_path}")
+                    flush_output()
+                    os.makedirs(optimal_parent_path, exist_ok=True)
+
+                    # Move the directory
+                    say(f"Moving directory from {target_directory} to {final_path}")
+                    # Show progress before a cross-filesystem move copies the whole tree
+                    flush_output()
+                    _move_directory(cfg, target_directory, final_path)
+                    say(f"✅ Directory moved to optimal location: {final_path}")
+                    final_location = final_path
+
+                    # Log successful move
+                    log_naming_attempt(
+                        naming_log,
+                        session_id=session_id,
+                        attempt_number=retry_count + 1,
+                        source_path=directory_path,
+                        generated_name=new_directory_name,
+                        optimal_parent=optimal_parent_path,
+                        user_action="moved_successfully",
+                        final_destination=str(final_path),
+                        analysis_summary=analysis_summary
+                    )
+                except Exception as e:
+                    say(f"Error moving directory to optimal location: {e}")
+                    say("Falling back to local rename...")
+
+                    # Log move failure
+                    log_naming_attempt(
+                        naming_log,
+                        session_id=session_id,
+                        attempt_number=retry_count + 1,
+                        source_path=directory_path,
+                        generated_name=new_directory_name,
+                        optimal_parent=optimal_parent_path,
+                        user_action="move_failed",
+                        feedback=f"Move error: {str(e)}",
+                        analysis_summary=analysis_summary
+                    )
+
+                    # Fallback to local rename
+                    parent_dir = target_directory.parent
+                    new_path = parent_dir / new_directory_name
+                    try:
+                        flush_output()
+                        _rename_directory(cfg, target_directory, new_path)
+                        say(f"✅ Directory renamed locally: {new_path}")
+                        final_location = new_path
+
+                        # Log successful local rename
+                        log_naming_attempt(
+                            naming_log,
+                            session_id=session_id,
+                            attempt_number=retry_count + 1,
+                            source_path=directory_path,
+                            generated_name=new_directory_name,
+                            optimal_parent="local_fallback",
+                            user_action="local_rename_success",
+                            final_destination=str(new_path),
+                            analysis_summary=analysis_summary
+                        )
+                    except Exception as e2:
+                        say(f"Error with local rename: {e2}")
+                        final_location = target_directory
+
+                        # Log total failure
+                        log_naming_attempt(
+                            naming_log,
+                            session_id=session_id,
+                            attempt_number=retry_count + 1,
+                            source_path=directory_path,
+                            generated_name=new_directory_name,
+                            optimal_parent="local_fallback",
+                            user_action="total_failure",
+                            feedback=f"Local rename error: {str(e2)}",
+                            final_destination=str(target_directory),
+                            analysis_summary=analysis_summary
+                        )
+            else:
+                # Local rename without DATA-HOME integration
+                # Check for naming conflicts and show final name
                 parent_dir = target_directory.parent
+                unique_name = _unique_name(parent_dir, new_directory_name)
+                if unique_name != new_directory_name:
+                    say(f"⚠️  Conflict detected. Final name will be: {unique_name}")
+                    new_directory_name = unique_name
                 new_path = parent_dir / new_directory_name
+
+                # Ask for consent to rename locally
+                proceed_with_rename = prompt_user_consent(
+                    f"\n📝 Would you like to rename the directory?",
+                    f"This will rename '{target_directory.name}' to '{new_directory_name}'"
+                )
+
+                if not proceed_with_rename:
+                    say("Directory rename cancelled by user.")
+                    say(f"Directory remains at: {target_directory}")
+                    sys.exit(0)
+
+                # NOW perform the actual rename after consent
                 try:
-                    target_directory.rename(new_path)
-                    print(f"✅ Directory renamed locally: {new_path}")
+                    say(f"Renaming directory from {target_directory} to {new_path}")
+                    flush_output()
+                    _rename_directory(cfg, target_directory, new_path)
+                    say(f"✅ Directory renamed to: {new_path}")
                     final_location = new_path
 
                     # Log successful local rename
                     log_naming_attempt(
+                        naming_log,
                         session_id=session_id,
                         attempt_number=retry_count + 1,
                         source_path=directory_path,
                         generated_name=new_directory_name,
-                        optimal_parent="local_fallback",
+                        optimal_parent="no_data_home",
                         user_action="local_rename_success",
                         final_destination=str(new_path),
                         analysis_summary=analysis_summary
                     )
-                except Exception as e2:
-                    print(f"Error with local rename: {e2}")
+                except Exception as e:
+                    say(f"Error renaming directory: {e}")
                     final_location = target_directory
 
-                    # Log total failure
+                    # Log rename failure
                     log_naming_attempt(
+                        naming_log,
                         session_id=session_id,
                         attempt_number=retry_count + 1,
                         source_path=directory_path,
                         generated_name=new_directory_name,
-                        optimal_parent="local_fallback",
-                        user_action="total_failure",
-                        feedback=f"Local rename error: {str(e2)}",
+                        optimal_parent="no_data_home",
+                        user_action="rename_failed",
+                        feedback=f"Rename error: {str(e)}",
                         final_destination=str(target_directory),
                         analysis_summary=analysis_summary
                     )
         else:
-            # Local rename without DATA-HOME integration
-            # Check for naming conflicts and show final name
-            parent_dir = target_directory.parent
-            new_path = parent_dir / new_directory_name
-            counter = 1
-            original_new_name = new_directory_name
-            temp_new_path = new_path
-            while temp_new_path.exists():
-                conflict_name = f"{original_new_name}{counter}"
-                temp_new_path = parent_dir / conflict_name
-                counter += 1
-
-            if counter > 1:
-                print(f"⚠️  Conflict detected. Final name will be: {temp_new_path.name}")
-                new_path = temp_new_path
-                new_directory_name = temp_new_path.name
-
-            # Ask for consent to rename locally
-            proceed_with_rename = prompt_user_consent(
-                f"\n📝 Would you like to rename the directory?",
-                f"This will rename '{target_directory.name}' to '{new_directory_name}'"
-            )
+            say("Failed to generate directory name")
+            final_location = target_directory
 
-            if not proceed_with_rename:
-                print("Directory rename cancelled by user.")
-                print(f"Directory remains at: {target_directory}")
-                sys.exit(0)
+    say("\n🎉 Processing complete!")
+    say(f"Final location: {final_location}")
 
-            # NOW perform the actual rename after consent
-            try:
-                print(f"Renaming directory from {target_directory} to {new_path}")
-                target_directory.rename(new_path)
-                print(f"✅ Directory renamed to: {new_path}")
-                final_location = new_path
+    # Display organization summary
+    if cfg.data_home and optimal_parent_path is not None:
+        try:
+            relative_path = Path(final_location).relative_to(data_home)
+        except ValueError:
+            # Local fallback rename left it outside DATA-HOME
+            relative_path = os.path.relpath(final_location, data_home)
+        say(f"DATA-HOME relative path: {relative_path}")
+        say(f"Taxonomical classification: {new_directory_name or 'default'}")
 
-                # Log successful local rename
-                log_naming_attempt(
-                    session_id=session_id,
-                    attempt_number=retry_count + 1,
-                    source_path=directory_path,
-                    generated_name=new_directory_name,
-                    optimal_parent="no_data_home",
-                    user_action="local_rename_success",
-                    final_destination=str(new_path),
-                    analysis_summary=analysis_summary
-                )
-            except Exception as e:
-                print(f"Error renaming directory: {e}")
-                final_location = target_directory
+    # Mention A/B testing log
+    say(f"\n📊 Session data logged to: {_LOG_FILE}")
+    say(f"   Session ID: {session_id}")
+    if retry_count > 0:
+        say(f"   Total attempts: {retry_count + 1}")
+        say(f"   Feedback provided: {len(feedback_history)} times")
 
-                # Log rename failure
-                log_naming_attempt(
-                    session_id=session_id,
-                    attempt_number=retry_count + 1,
-                    source_path=directory_path,
-                    generated_name=new_directory_name,
-                    optimal_parent="no_data_home",
-                    user_action="rename_failed",
-                    feedback=f"Rename error: {str(e)}",
-                    final_destination=str(target_directory),
-                    analysis_summary=analysis_summary
-                )
-    else:
-        print("Failed to generate directory name")
-        final_location = target_directory
 
-    print("\n🎉 Processing complete!")
-    print(f"Final location: {final_location}")
+def _speculate(fn, *args, **kwargs) -> Future:
+    """Run fn on a daemon thread and return a Future for its result.
 
-    # Display organization summary
-    if data_home_root and 'optimal_parent_path' in locals():
-        relative_path = os.path.relpath(str(final_location), data_home_root)
-        print(f"DATA-HOME relative path: {relative_path}")
-        print(f"Taxonomical classification: {new_directory_name if 'new_directory_name' in locals() else 'default'}")
+    Unlike an executor worker, an abandoned call (Ctrl-C at a prompt, or an
+    error) doesn't hold up interpreter exit while the SDK retries.
+    """
+    future = Future()
 
-    # Mention A/B testing log
-    script_dir = Path(__file__).parent
-    log_file = script_dir / "naming_ab_testing_log.csv"
-    print(f"\n📊 Session data logged to: {log_file}")
-    print(f"   Session ID: {session_id}")
-    if retry_count > 0:
-        print(f"   Total attempts: {retry_count + 1}")
-        print(f"   Feedback provided: {len(feedback_history)} times")
+    def run() -> None:
+        future.set_running_or_notify_cancel()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, daemon=True).start()
+    return future
 
 
-def log_naming_attempt(session_id: str, attempt_number: int, source_path: str, generated_name: str,
-                      optimal_parent: str, user_action: str, feedback: str = "",
+def _retry_with_datahome(cfg: Config, naming_agent: DirectoryNamingAgent, analysis_data: dict, analysis_json: str,
+                         source_path: str, feedback: str = None,
+                         pending_name: Optional[Future] = None) -> tuple[Optional[str], Optional[str]]:
+    """Generate a name for one naming attempt and its optimal parent under DATA-HOME."""
+    directory_name = pending_name.result() if pending_name is not None else None
+    if not directory_name:
+        directory_name = naming_agent.generate_directory_name_with_feedback(
+            analysis_data, feedback, analysis_json=analysis_json
+        )
+    if not directory_name:
+        return None, None
+
+    # The original directory path drives source-based routing rules
+    return directory_name, naming_agent.determine_optimal_parent_directory(directory_name, cfg.data_home, source_path)
+
+
+def _retry_local(cfg: Config, naming_agent: DirectoryNamingAgent, analysis_data: dict, analysis_json: str,
+                 source_path: str, feedback: str = None,
+                 pending_name: Optional[Future] = None) -> tuple[Optional[str], None]:
+    """Generate a name for one naming attempt without DATA-HOME placement."""
+    directory_name = pending_name.result() if pending_name is not None else None
+    if directory_name:
+        return directory_name, None
+    return naming_agent.generate_directory_name_with_feedback(analysis_data, feedback, analysis_json=analysis_json), None
+
+
+def _move_directory(cfg: Config, source: Path, destination: Path) -> None:
+    """Move a directory with a single rename, copying only when it crosses filesystems."""
+    try:
+        os.rename(source, destination)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.move(str(source), str(destination))
+    if cfg.durable:
+        # Persist both directory entries; a cross-filesystem copy's file contents
+        # are left to the OS to write back
+        _sync_directory(destination.parent)
+        _sync_directory(source.parent)
+
+
+def _rename_directory(cfg: Config, source: Path, destination: Path) -> None:
+    """Rename a directory in place, syncing the parent directory when durability is requested."""
+    os.replace(source, destination)
+    if cfg.durable:
+        _sync_directory(destination.parent)
+
+
+def _sync_directory(path: Path) -> None:
+    """fsync a directory so renames within it survive a crash.
+
+    Best-effort: the rename has already happened, so a filesystem that can't
+    sync directories (some FUSE/SMB/NFS mounts) only gets a warning. A no-op
+    without os.O_DIRECTORY.
+    """
+    if not hasattr(os, 'O_DIRECTORY'):
+        return
+    try:
+        dfd = os.open(path, os.O_DIRECTORY)
+        try:
+            os.fsync(dfd)
+        finally:
+            os.close(dfd)
+    except OSError as e:
+        say(f"⚠️  Could not sync {path} to disk: {e}")
+
+
+def _unique_name(parent: Path, base: str) -> str:
+    """Return base, or base with the first free numeric suffix, from one listing of parent."""
+    try:
+        with os.scandir(parent) as entries:
+            existing = {entry.name for entry in entries}
+    except (FileNotFoundError, NotADirectoryError):
+        # Parent doesn't exist yet (or isn't a directory) - nothing can conflict,
+        # and the move itself reports anything that really is wrong
+        return base
+    except PermissionError:
+        # Searchable but not listable - candidates are checked one by one
+        existing = None
+    else:
+        if _CASE_INSENSITIVE_FS:
+            existing = {name.casefold() for name in existing}
+
+    def taken(candidate: str) -> bool:
+        if existing is None:
+            return (parent / candidate).exists()
+        return (candidate.casefold() if _CASE_INSENSITIVE_FS else candidate) in existing
+
+    name = base
+    counter = 1
+    while taken(name):
+        name = f"{base}{counter}"
+        counter += 1
+    return name
+
+
+class NamingAttemptLog:
+    """CSV log of naming attempts, kept open for the whole session."""
+
+    def __init__(self, log_file: Path):
+        self.log_file = log_file
+        self._csvfile = None
+        self._writer = None
+        self._header_pending = False
+
+    def __enter__(self) -> "NamingAttemptLog":
+        self._csvfile = open(self.log_file, 'a', newline='', encoding='utf-8')
+        self._writer = csv.DictWriter(self._csvfile, fieldnames=_LOG_FIELDS, extrasaction='ignore')
+        # Append mode starts at the end of the file, so position 0 means it's new
+        self._header_pending = self._csvfile.tell() == 0
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._csvfile.close()
+
+    def write(self, log_entry: dict) -> None:
+        """Append one row, writing the header first if the log file is new."""
+        assert set(log_entry) == set(_LOG_FIELDS), "log entry doesn't match _LOG_FIELDS"
+        if self._header_pending:
+            self._writer.writeheader()
+            self._header_pending = False
+            say(f"📊 Created A/B testing log: {self.log_file}")
+
+        self._writer.writerow(log_entry)
+        # Keep the log intact if the session is interrupted at a prompt
+        self._csvfile.flush()
+
+
+def log_naming_attempt(naming_log: NamingAttemptLog, session_id: str, attempt_number: int, source_path: str,
+                      generated_name: str, optimal_parent: str, user_action: str, feedback: str = "",
                       final_destination: str = "", analysis_summary: dict = None):
     """Log naming attempt data to CSV for A/B testing analysis."""
 
-    # Get the directory where the script is located
-    script_dir = Path(__file__).parent
-    log_file = script_dir / "naming_ab_testing_log.csv"
-
     # Prepare log data
     log_entry = {
         'timestamp': datetime.now().isoformat(),
@@ -498,20 +770,7 @@ def log_naming_attempt(session_id: str, attempt_number: int, source_path: str, g
         'feedback_categories': categorize_feedback(feedback) if feedback else ""
     }
 
-    # Create CSV with headers if it doesn't exist
-    file_exists = log_file.exists()
-
-    with open(log_file, 'a', newline='', encoding='utf-8') as csvfile:
-        fieldnames = log_entry.keys()
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-
-        # Write header if file is new
-        if not file_exists:
-            writer.writeheader()
-            print(f"📊 Created A/B testing log: {log_file}")
-
-        # Write the log entry
-        writer.writerow(log_entry)
+    naming_log.write(log_entry)
 
 
 def categorize_feedback(feedback: str) -> str:
@@ -519,37 +778,14 @@ def categorize_feedback(feedback: str) -> str:
     if not feedback:
         return ""
 
-    feedback_lower = feedback.lower()
-    categories = []
-
-    # Content specificity
-    if any(word in feedback_lower for word in ['generic', 'specific', 'vague', 'unclear']):
-        categories.append('specificity')
-
-    # Length concerns
-    if any(word in feedback_lower for word in ['long', 'short', 'length', 'brief', 'verbose']):
-        categories.append('length')
-
-    # Location/path concerns
-    if any(word in feedback_lower for word in ['location', 'directory', 'path', 'folder', 'place']):
-        categories.append('location')
-
-    # Content focus
-    if any(word in feedback_lower for word in ['topic', 'subject', 'focus', 'about', 'theme']):
-        categories.append('content_focus')
-
-    # Abbreviation concerns
-    if any(word in feedback_lower for word in ['abbreviation', 'abbrev', 'short', 'expand']):
-        categories.append('abbreviations')
-
-    # Missing information
-    if any(word in feedback_lower for word in ['missing', 'include', 'add', 'mention']):
-        categories.append('missing_info')
-
-    # Context concerns
-    if any(word in feedback_lower for word in ['context', 'background', 'situation']):
-        categories.append('context')
+    # One scan over the lowercased feedback finds every keyword occurrence. Lowercasing
+    # first (not re.IGNORECASE, whose Unicode folding matches e.g. "ſhort") keeps
+    # every match an exact key of _FEEDBACK_KEYWORD_CATEGORIES
+    matched = set()
+    for match in _FEEDBACK_KEYWORD_RE.finditer(feedback.lower()):
+        matched.update(_FEEDBACK_KEYWORD_CATEGORIES[match.group(1)])
 
+    categories = [category for category in _FEEDBACK_CATEGORIES if category in matched]
     return '|'.join(categories) if categories else 'other'
 
 
@@ -560,56 +796,56 @@ def generate_session_id() -> str:
 
 def prompt_user_naming_satisfaction() -> str:
     """Ask user if they're satisfied with the generated name."""
-    print("\n🤔 How do you feel about this directory name and location?")
-    print("  1. ✅ Accept - I like this name and location")
-    print("  2. 🔄 Try again - I'd like a different name")
+    say("\n🤔 How do you feel about this directory name and location?")
+    say("  1. ✅ Accept - I like this name and location")
+    say("  2. 🔄 Try again - I'd like a different name")
 
     while True:
-        response = input("\nChoose option (1 or 2): ").strip()
+        response = ask("\nChoose option (1 or 2): ").strip()
         if response == "1":
             return "accept"
         elif response == "2":
             return "retry"
         else:
-            print("Please enter '1' to accept or '2' to try again.")
+            say("Please enter '1' to accept or '2' to try again.")
 
 
 def collect_user_feedback(directory_name: str, parent_path: str = None) -> str:
     """Collect specific feedback about what the user didn't like."""
-    print(f"\n💬 What didn't you like about the name '{directory_name}'?")
+    say(f"\n💬 What didn't you like about the name '{directory_name}'?")
     if parent_path:
-        print(f"   or the location '{parent_path}'?")
+        say(f"   or the location '{parent_path}'?")
 
-    print("\nPlease be specific about what you'd like changed:")
-    print("  • Too generic? (suggest more specific terms)")
-    print("  • Wrong focus? (mention what should be emphasized)")
-    print("  • Poor location? (suggest better parent directory)")
-    print("  • Missing context? (what information should be included)")
-    print("  • Too long/short? (preferred length)")
-    print("  • Wrong abbreviations? (suggest alternatives)")
+    say("\nPlease be specific about what you'd like changed:")
+    say("  • Too generic? (suggest more specific terms)")
+    say("  • Wrong focus? (mention what should be emphasized)")
+    say("  • Poor location? (suggest better parent directory)")
+    say("  • Missing context? (what information should be included)")
+    say("  • Too long/short? (preferred length)")
+    say("  • Wrong abbreviations? (suggest alternatives)")
 
-    feedback = input("\nYour feedback: ").strip()
+    feedback = ask("\nYour feedback: ").strip()
 
     if not feedback:
-        return "Please make the name more specific and descriptive"
+        return _DEFAULT_FEEDBACK
 
     return feedback
 
 
 def prompt_user_consent(question: str, description: str = "") -> bool:
     """Prompt user for consent with a clear question and optional description."""
-    print(question)
+    say(question)
     if description:
-        print(f"  {description}")
+        say(f"  {description}")
 
     while True:
-        response = input("\nProceed? (y/n): ").strip().lower()
+        response = ask("\nProceed? (y/n): ").strip().lower()
         if response in ['y', 'yes']:
             return True
         elif response in ['n', 'no']:
             return False
         else:
-            print("Please enter 'y' for yes or 'n' for no.")
+            say("Please enter 'y' for yes or 'n' for no.")
 
 if __name__ == "__main__":
     main()